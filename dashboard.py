@@ -1,66 +1,182 @@
+import hashlib
+import io
+import os
 import pathlib
+import tempfile
 import requests
+import numpy as np
 import pandas as pd
-import altair as alt
-from lxml import html
+from lxml import etree
 import streamlit as st
 
 
 #############
 # FUNCTIONS #
 ############################################################################################################################
+def read_excel_cached(excel_file: pathlib.Path, cache_path: pathlib.Path, sheets: list, **kwargs) -> dict:
+    """
+    Read sheets of excel file or their parquet copies from the cache, if those were parsed from identical content.
+
+    ```
+    :param excel_file:      path to excel file
+    :param cache_path:      path to folder holding cached copies
+    :param sheets:          names of sheets to read
+    :param kwargs:          keyword arguments passed on to pd.read_excel
+    :return data:           dictionary with dataframe for each sheet
+    ```
+    """
+    # key on file content rather than mtime (git checkouts reset mtimes), cached copy depends on parse options as well
+    file_hash = hashlib.blake2b(excel_file.read_bytes(), digest_size=16)
+    file_hash.update(repr(sorted(kwargs.items())).encode())
+    cache_files = {sheet: cache_path / f'{excel_file.stem}_{sheet}_{file_hash.hexdigest()}.parquet' for sheet in sheets}
+    if all(c.exists() for c in cache_files.values()):
+        try:
+            return {sheet: pd.read_parquet(c) for sheet, c in cache_files.items()}
+        except (OSError, ValueError):  # damaged cached copy, parse excel file again and overwrite it
+            pass
+
+    data = pd.read_excel(excel_file, sheet_name=sheets, **kwargs)
+    tmp_file = None
+    try:  # store parsed data for the next cold start
+        cache_path.mkdir(exist_ok=True)
+        for sheet, df in data.items():
+            # unique temporary file per writer, so concurrent cold starts don't write into the same file
+            with tempfile.NamedTemporaryFile(dir=cache_path, suffix='.tmp', delete=False) as tmp_file:
+                df.to_parquet(tmp_file)
+            os.replace(tmp_file.name, cache_files[sheet])  # atomic, interrupted writes can't leave a truncated copy
+            for old_file in cache_path.glob(f'{excel_file.stem}_{sheet}_*.parquet'):  # drop outdated copies
+                if old_file != cache_files[sheet]:
+                    old_file.unlink(missing_ok=True)
+    except (OSError, ValueError, TypeError):  # if data folder is read-only or sheet can't be stored, skip caching
+        if tmp_file is not None:  # remove partially written copy
+            pathlib.Path(tmp_file.name).unlink(missing_ok=True)
+
+    return data
+
+
 # NOTE: this could also be hosted on google drive instad of inside the repo
-def load_data(data_path: pathlib.Path = pathlib.Path(__file__).parent / 'data') -> tuple:
+def load_dates(data_path: pathlib.Path = pathlib.Path(__file__).parent / 'data') -> tuple:
     """
-    Load data from excel files in pre-defined format
+    Find game files and their matchday dates, without opening them.
 
     :param data_path:               path to excel files
     :return dates:                  return dates of matchdays
-    :return game_data:              return corresponding game data in dataframe
-    :return roster:                 return flamingos player roster in dataframe
+    :return game_files:             return paths to corresponding game files
     ```
     """
     game_path = data_path / 'games/'
-    excel_files = list(game_path.glob('*.xlsx'))
-    # store all dates and game data
-    game_data = [pd.read_excel(e, sheet_name=['Basics', 'TeamA', 'TeamB', 'Rundown']) for e in excel_files]
-    dates = pd.Series([pd.to_datetime(e.name.split('_')[-1].split('.')[0], dayfirst=True) for e in excel_files])
+    game_files = list(game_path.glob('*.xlsx'))
+    date_strs = [e.stem.rsplit('_', 1)[-1] for e in game_files]
+    dates = pd.Series(pd.to_datetime(date_strs, format='%d-%m-%Y'))  # explicit format skips inference per file
     # sort by date
-    dates.sort_values(inplace=True)
-    game_data = [game_data[i] for i in dates.index]
-    # read roster
-    roster = pd.read_excel(data_path / 'roster.xlsx')
+    order = np.argsort(dates.values, kind='stable')
+    dates = dates.iloc[order]
+    game_files = [game_files[i] for i in order]
 
-    return dates, game_data, roster
+    return dates, game_files
 
 
-def generate_foul_line(minute: float, score: dict, teamA_data: pd.DataFrame,
-                       teamB_data: pd.DataFrame, teamA: str, teamB: str) -> tuple:
+@st.cache_data(show_spinner=False)  # callers already wrap loading in a named spinner
+def load_game(game_file: pathlib.Path, file_mtime: float,
+              cache_path: pathlib.Path = pathlib.Path(__file__).parent / 'data/cache/') -> dict:
     """
-    Generate line for foul play in rundown.
+    Load data of a single game from excel file in pre-defined format
+
+    :param game_file:               path to excel file of the game
+    :param file_mtime:              modification time of game file, so in-memory cache is renewed once file changes
+    :param cache_path:              path to folder holding cached copies
+    :return game_data:              return game data in dictionary of dataframes
+    ```
+    """
+    sheets = ['Basics', 'TeamA', 'TeamB', 'Rundown']
+    # fixed dtypes for known columns, so they don't have to be inferred
+    dtypes = {'#': 'Int16', 'Name': 'category', 'Minute': 'Int16', '# A': 'Int16', '# B': 'Int16',
+              'Score A': 'string', 'Score B': 'string',
+              **{qtr: 'Int16' for qtr in ['1/4', '2/4', '3/4', '4/4', 'Final']},  # quarter scores
+              **{f'{n}. Foul': 'Int16' for n in range(1, 6)}}  # minutes of personal fouls
+    game_data = read_excel_cached(game_file, cache_path, sheets, engine='calamine', dtype=dtypes)
+
+    return game_data
+
+
+@st.cache_data(show_spinner=False)
+def load_roster(data_path: pathlib.Path = pathlib.Path(__file__).parent / 'data') -> pd.DataFrame:
+    """
+    Load flamingos player roster from excel file.
+
+    :param data_path:               path to excel files
+    :return roster:                 return flamingos player roster in dataframe
+    ```
+    """
+    roster = read_excel_cached(data_path / 'roster.xlsx', data_path / 'cache/', ['roster'], engine='calamine',
+                               dtype={'#': 'Int16', 'Name': 'category'})['roster']
+
+    return roster
+
+
+def build_foul_map(teamA_data: pd.DataFrame, teamB_data: pd.DataFrame, teamA: str, teamB: str) -> dict:
+    """
+    Map each minute with a foul to the team and player who commited it.
 
     ```
-    :param minute:         current minute of the match
     :param teamA_data:     player data for Team A
     :param teamB_data:     player data for Team B
     :param teamA:          name of Team A
     :param teamB:          name of Team B
-    :return foul_line:     line for foul play in rundown
+    :return foul_map:      dictionary mapping minute to (team, player) of the foul
     ```
     """
-    fouled_A = (teamA_data.iloc[:, 3:] == minute).sum(1).astype(bool)
-    fouled_B = (teamB_data.iloc[:, 3:] == minute).sum(1).astype(bool)
-    if fouled_A.sum() or fouled_B.sum():  # if multiple players fouled in the same min, this will only print the 1st
-        player_fouled = teamA_data[fouled_A].Name.values[0] if fouled_A.sum() else teamB_data[fouled_B].Name.values[0]
-        team_fouled = teamA if fouled_A.sum() else teamB
-        fl_entry_A = f'{player_fouled} commited a foul 🚨' if team_fouled in teamA else ''
-        fl_entry_B = f'{player_fouled} commited a foul 🚨' if team_fouled in teamB else ''
-        scoreA, scoreB = score.values()
-        foul_line = f'| {int(minute):02d} | {fl_entry_A} | {int(scoreA):d}:{int(scoreB):d} | {fl_entry_B} |'
-    else:
-        foul_line, team_fouled, player_fouled = None, None, None
+    minutes, teams, names = [], [], []
+    for team_data, team in zip([teamA_data, teamB_data], [teamA, teamB]):
+        foul_minutes = team_data.iloc[:, 3:].to_numpy(dtype=np.int16, na_value=-1)
+        rows, cols = np.nonzero(foul_minutes >= 0)  # row-major, so in roster order
+        minutes.append(foul_minutes[rows, cols])
+        teams.append(np.full(rows.size, team))
+        names.append(team_data['Name'].to_numpy(dtype=str)[rows])
+    minutes, teams, names = map(np.concatenate, [minutes, teams, names])
+    # if multiple players fouled in the same min, this will only keep the 1st
+    _, first = np.unique(minutes, return_index=True)
+    foul_map = dict(zip(minutes[first].tolist(), zip(teams[first].tolist(), names[first].tolist())))
+
+    return foul_map
+
+
+def classify_plays(raw_rundown: pd.DataFrame, teamA_data: pd.DataFrame, teamB_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gather minute, scoring team and player as well as points and type of play for each entry of the rundown.
 
-    return foul_line, team_fouled, player_fouled
+    ```
+    :param raw_rundown:    rundown of the match as in the match report
+    :param teamA_data:     player data for Team A
+    :param teamB_data:     player data for Team B
+    :return plays:         dataframe with minute, team letter, player name, points and play for each entry
+    ```
+    """
+    num_to_name = {'A': dict(zip(teamA_data['#'], teamA_data['Name'])),
+                   'B': dict(zip(teamB_data['#'], teamB_data['Name']))}
+    valid = (raw_rundown[['Minute', '# A', '# B']] >= 0).fillna(False).astype(bool)  # missing entries are NA
+    scored_A, scored_B = valid['# A'], valid['# B']
+    minutes = raw_rundown['Minute'].where(valid['Minute']).ffill().fillna(0)  # gather current minute
+
+    # gather scoring player and team, rows without number are the second free throw of the same player
+    whoscored = pd.Series(np.select([scored_A, scored_B], ['A', 'B'], None), index=raw_rundown.index)
+    names = raw_rundown['# A'].map(num_to_name['A']).where(scored_A, raw_rundown['# B'].map(num_to_name['B']))
+    wrong_number = (scored_A | scored_B) & names.isna()
+    assert not wrong_number.any(), f'Error: Wrong player number in minute {minutes[wrong_number].iloc[0]}!'
+    whoscored, names = whoscored.ffill(), names.where(scored_A | scored_B).ffill()
+
+    # gather points as difference to the last score of the scoring team
+    entries = raw_rundown['Score A'].where(whoscored == 'A', raw_rundown['Score B'])
+    entries_num = pd.to_numeric(entries, errors='coerce')
+    last_score = {team: entries_num.where(whoscored == team).ffill().fillna(0).shift(fill_value=0) for team in 'AB'}
+    points = (entries_num - last_score['A'].where(whoscored == 'A', last_score['B'])).fillna(0).astype(int)
+    valid_points = points.isin([1, 2, 3]) | (entries == '-').fillna(False)
+    assert valid_points.all(), 'Error: No valid number of points made but also \
+        no sign for missed freethrow!'
+    plays = np.select([points == 3, points == 2, points == 1],
+                      ['hit a three 🎯', 'made a bucket ⛹️‍♂️', 'made a free throw 🏀'], 'missed a free throw 🧱')
+
+    return pd.DataFrame({'Minute': minutes, 'Team': whoscored, 'Name': names, 'Points': points, 'Play': plays})
 
 
 def build_rundown(game_data: dict) -> tuple:
@@ -76,103 +192,88 @@ def build_rundown(game_data: dict) -> tuple:
     raw_rundown, teamA_data, teamB_data = game_data['Rundown'], game_data['TeamA'], game_data['TeamB']
     teamA, teamB = game_data['Basics']['Name'].values
     stats = ['Player', 'PF', 'FGM', '3PM', 'FTM', 'FTA', 'FT%', 'PTS']
-    player_stats = {team: pd.DataFrame(0, index=game_data[ord]['Name'], columns=stats)
-                    for ord, team in zip(['TeamA', 'TeamB'], [teamA, teamB])}
-
-    # running variables
-    minute, foul_min = 0, 0
-    score = {'A': 0, 'B': 0}
-    whoscored = ''
+    plays = classify_plays(raw_rundown, teamA_data, teamB_data)
+    foul_map = build_foul_map(teamA_data, teamB_data, 'A', 'B')
+    is_A, is_B = plays.Team == 'A', plays.Team == 'B'
+
+    # running score after each play
+    scoreA, scoreB = plays.Points.where(is_A, 0).cumsum(), plays.Points.where(is_B, 0).cumsum()
+    minute_str = plays.Minute.astype(int).astype(str).str.zfill(2)
+    score_str = scoreA.astype(str) + ':' + scoreB.astype(str)
+    prev_score_str = scoreA.shift(fill_value=0).astype(str) + ':' + scoreB.shift(fill_value=0).astype(str)
+
+    # make entry for nicer rundown
+    entry = plays.Name + ' ' + plays.Play
+    play_lines = '| ' + minute_str + ' | ' + entry.where(is_A, '') + ' |' + score_str + ' | ' + \
+        entry.where(is_B, '') + ' |'
+
+    # fouls are printed once at the first play of the minute, before it for free throws and after it otherwise
+    fouled = ~plays.Minute.duplicated() & plays.Minute.isin(foul_map)
+    free_throw = plays.Points <= 1
+    fouls = pd.DataFrame(plays.Minute[fouled].map(foul_map).tolist(), index=plays.index[fouled],
+                         columns=['Team', 'Name'])
+    foul_entry = fouls.Name + ' commited a foul 🚨'
+    foul_score = prev_score_str.where(free_throw, score_str)[fouled]
+    foul_lines = '| ' + minute_str[fouled] + ' | ' + foul_entry.where(fouls.Team == 'A', '') + ' | ' + foul_score + \
+        ' | ' + foul_entry.where(fouls.Team == 'B', '') + ' |'
+
+    # add line for end of quarter, only print at the last play of the quarter
+    next_minute = plays.Minute.shift(-1)
+    qtr_end = (plays.Minute % 10 == 0) & (plays.Minute < 40) & (next_minute > plays.Minute)
+    position = {1: 'st', 2: 'nd', 3: 'rd'}
+    qtr = (plays.Minute[qtr_end] // 10).astype(int)
+    qtr_lines = '||||| **End of ' + qtr.astype(str) + qtr.map(position) + ' quarter**'
+
+    # merge all lines by position in the rundown
+    lines = pd.concat([pd.DataFrame({'line': foul_lines, 'order': np.where(free_throw[fouled], 0, 2)}),
+                       pd.DataFrame({'line': play_lines, 'order': 1}),
+                       pd.DataFrame({'line': qtr_lines, 'order': 3})])
+    lines = lines.rename_axis('pos').sort_values(['pos', 'order']).line
     nicer_rundown = [f'| Minute | {teamA} | Score | {teamB} |', '|:---:|:-----------|:-----:|-----------:|']
-    for row in raw_rundown.iterrows():
-        if row[1].Minute >= 0:  # gather current minute
-            minute = row[1].Minute
-
-        if row[1]['# A'] >= 0:  # gather scoring player and team name
-            whoscored = 'A'
-            team = teamA
-            assert (row[1]['# A'] == teamA_data['#']).sum(), f'Error: Wrong player number in minute {minute}!'
-            name = teamA_data[row[1]['# A'] == teamA_data['#']].Name.values[0]
-        elif row[1]['# B'] >= 0:
-            whoscored = 'B'
-            team = teamB
-            assert (row[1]['# B'] == teamB_data['#']).sum(), f'Error: Wrong player number in minute {minute}!'
-            name = teamB_data[row[1]['# B'] == teamB_data['#']].Name.values[0]
-        else:  # catching second free throw case
-            pass  # same player and team scores
-
-        #  gather scoring type
-        points = row[1][f'Score {whoscored}'] - score[whoscored] if str(row[1][f'Score {whoscored}']).isdigit() else 0
-        if points == 3:
-            play = 'hit a three 🎯'
-            player_stats[team].loc[name, '3PM'] += 1  # add to player stats
-        elif points == 2:
-            play = 'made a bucket ⛹️‍♂️'
-            player_stats[team].loc[name, 'FGM'] += 1  # add to player stats
-        elif points == 1:
-            # look for fouls in this minute since there were free throws
-            foul_line, team_fouled, player_fouled = generate_foul_line(minute, score, teamA_data, teamB_data, teamA, teamB)
-            if foul_line and foul_min != minute:  # only print once
-                foul_min = minute
-                nicer_rundown.append(foul_line)
-                player_stats[team_fouled].loc[player_fouled, 'PF'] += 1  # add foul to player stats
-
-            play = 'made a free throw 🏀'
-            player_stats[team].loc[name, 'FTM'] += 1  # add to player stats
-            player_stats[team].loc[name, 'FTA'] += 1
-        else:
-            assert row[1][f'Score {whoscored}'] in '-', 'Error: No valid number of points made but also \
-                no sign for missed freethrow!'
-            # look for fouls in this minute since there were free throws
-            foul_line, team_fouled, player_fouled = generate_foul_line(minute, score, teamA_data, teamB_data, teamA, teamB)
-            if foul_line and foul_min != minute:  # only print once
-                foul_min = minute
-                nicer_rundown.append(foul_line)
-                player_stats[team_fouled].loc[player_fouled, 'PF'] += 1  # add foul to player stats
-
-            play = 'missed a free throw 🧱'
-            player_stats[team].loc[name, 'FTA'] += 1  # add to player stats
-
-        score[whoscored] += points
-        player_stats[team].loc[name, 'PTS'] += points  # add to player stats
-
-        # make entry for nicer rundown
-        scoreA, scoreB = score.values()
-        entry_A = f'{name} {play}' if team in teamA else ''
-        entry_B = f'{name} {play}' if team in teamB else ''
-        line = f'| {int(minute):02d} | {entry_A} |{int(scoreA):d}:{int(scoreB):d} | {entry_B} |'
-        nicer_rundown.append(line)
-
-        # look for fouls in this minute not related to free throws
-        foul_line, team_fouled, player_fouled = generate_foul_line(minute, score, teamA_data, teamB_data, teamA, teamB)
-        if foul_line and foul_min != minute:  # only print once
-            foul_min = minute
-            nicer_rundown.append(foul_line)
-            player_stats[team_fouled].loc[player_fouled, 'PF'] += 1  # add foul to player stats
-
-        # add line for end of quarter
-        if minute % 10 == 0 and minute < 40:
-            position = {1: 'st', 2: 'nd', 3: 'rd'}
-            qtr = int(minute // 10)
-            qtr_line = f'||||| **End of {qtr}{position[qtr]} quarter**'
-            if raw_rundown.iloc[row[0] + 1].Minute > minute:  # only print at the end
-                nicer_rundown.append(qtr_line)
+    nicer_rundown += lines.tolist()
 
     # add lines for end of game
-    winner = teamA if scoreA > scoreB else teamB
+    winner = teamA if scoreA.iloc[-1] > scoreB.iloc[-1] else teamB
     end = ['||||| **End of 4th quarter**', f'||||| ***End of Game, Team {winner} Wins***']
     nicer_rundown += end
     nicer_rundown = '\n'.join(nicer_rundown)
-    # calculate overall FT percentage and add nbr
-    for team in [teamA, teamB]:
-        player_stats[team]['FT%'] = 100 * player_stats[team]['FTM'] / player_stats[team]['FTA']
+    # aggregate plays and fouls to player stats
+    play_stats = pd.DataFrame({'Team': plays.Team, 'Name': plays.Name, 'FGM': (plays.Points == 2).astype(int),
+                               '3PM': (plays.Points == 3).astype(int), 'FTM': (plays.Points == 1).astype(int),
+                               'FTA': (plays.Points <= 1).astype(int), 'PTS': plays.Points})
+    foul_stats = fouls.assign(PF=1)
+    # no need to sort groups, since rows are reindexed to roster order below
+    counts = pd.concat([play_stats, foul_stats]).fillna(0).groupby(['Team', 'Name'], sort=False).sum().astype(int)
+    counts = counts.rename(index={'A': teamA, 'B': teamB}, level='Team')
+    player_stats = {}
     for ord, team in zip(['TeamA', 'TeamB'], [teamA, teamB]):
-        player_stats[team]['Player'] = player_stats[team].index
-        player_stats[team].index = [game_data[ord]['#'].values]
+        roster = game_data[ord]
+        team_stats = counts.reindex(index=pd.MultiIndex.from_product([[team], roster['Name']]), columns=stats,
+                                    fill_value=0)
+        # index by player nbr and calculate overall FT percentage
+        team_stats.index = roster['#'].values
+        team_stats['Player'] = roster['Name'].values
+        ftm, fta = team_stats['FTM'].to_numpy(), team_stats['FTA'].to_numpy()
+        team_stats['FT%'] = np.divide(100 * ftm, fta, out=np.full(fta.shape, np.nan), where=fta > 0)
+        player_stats[team] = team_stats
 
     return nicer_rundown, player_stats
 
 
+@st.cache_data(show_spinner=False)
+def load_rundown(game_file: pathlib.Path, file_mtime: float) -> tuple:
+    """
+    Build rundown of a single game, cached by its file so the game data doesn't need to be hashed.
+
+    :param game_file:               path to excel file of the game
+    :param file_mtime:              modification time of game file, so in-memory cache is renewed once file changes
+    :return nicer_rundown:          list of markdown formatted strings for each game event
+    :return player_stats:           detailed stats for each player
+    ```
+    """
+    return build_rundown(load_game(game_file, file_mtime))
+
+
 def general_game_info(game_basics: pd.DataFrame) -> None:
     """
     Generate page for general game info
@@ -191,21 +292,23 @@ def general_game_info(game_basics: pd.DataFrame) -> None:
         st.markdown('### vs.')
 
 
-def team_stat_charts(player_stats: dict) -> list:
+@st.cache_data(show_spinner=False)  # chart specs only change with the selected game
+def team_stat_charts(player_stats: dict) -> 'alt.HConcatChart':
     """
     Build charts for team specific statistics.
 
     ```
     :param player_stats:         dictionary of dataframes containing player stats
-    :return charts:              list containing altair charts of team stats
+    :return charts:              altair charts of team stats, concatenated to be rendered as one
     ```
     """
+    import altair as alt  # heavy import, only needed once charts are actually drawn
+
     stats = ['FGM', '3PM', 'FT%', 'PF']
     # create team stats dataframe
-    team_stats = pd.DataFrame(0, columns=stats, index=player_stats.keys())
-    for team in team_stats.index:
-        team_stats.loc[team] = player_stats[team].agg({'FGM': sum, '3PM': sum, 'FT%': 'mean', 'PF': sum})
-    team_stats['Team'] = team_stats.index
+    all_stats = pd.concat(player_stats, names=['Team'])
+    team_stats = all_stats.groupby(level='Team', sort=False).agg({'FGM': 'sum', '3PM': 'sum', 'FT%': 'mean',
+                                                                  'PF': 'sum'}).reset_index()
 
     # create altair donut charts for each stat
     charts_base = [alt.Chart(team_stats).encode(theta=alt.Theta(f'{stat}:Q', stack=True),
@@ -218,18 +321,22 @@ def team_stat_charts(player_stats: dict) -> list:
     # charts_numbers = [cbase.mark_text(radius=170, size=20).encode(text=alt.Text(f'{stat}:Q', format=",.0f"))
     #                   for cbase, stat in zip(charts_base, stats)]
     # charts = [donut_1 for donut_1, number in zip(charts_donuts_1, charts_numbers)]
+    charts = alt.hconcat(*charts_donuts_1).resolve_scale(theta='independent')  # single spec for vega to render
 
-    return charts_donuts_1
+    return charts
 
 
-def game_details_page(game_dat: dict) -> None:
+def game_details_page(game_file: pathlib.Path) -> None:
     """
     Build page to display nice game stats.
 
-    :param game_dat:      dictionary containing dataframes with game info
+    :param game_file:     path to excel file of the game
     """
-    # generate rundown
-    rundown, player_stats = build_rundown(game_dat)
+    # load game data and generate rundown
+    with st.spinner('Loading Game Data...'):
+        file_mtime = game_file.stat().st_mtime
+        game_dat = load_game(game_file, file_mtime)
+        rundown, player_stats = load_rundown(game_file, file_mtime)
 
     # display selected game data
     general_game_info(game_dat['Basics'])
@@ -237,11 +344,7 @@ def game_details_page(game_dat: dict) -> None:
 
     with tab1:
         # print team stats in donut charts
-        altair_charts = team_stat_charts(player_stats)
-        cols = st.columns(len(altair_charts))
-        for col, chart in zip(cols, altair_charts):
-            with col:
-                st.altair_chart(chart, use_container_width=True)
+        st.altair_chart(team_stat_charts(player_stats))
 
         with st.container():
             st.caption("Team Scores by Quarter")
@@ -253,38 +356,63 @@ def game_details_page(game_dat: dict) -> None:
             for col, team in zip([col1, col2], game_dat['Basics'].Name.values):
                 with col:
                     st.caption(f'Player Statistics {team}')
-                    styled_stats = player_stats[team].sort_index().style.format(precision=0, na_rep='No FTA')
-                    st.dataframe(styled_stats, use_container_width=True)
+                    # format via column config, rendering a pandas Styler is much slower
+                    ft_col = st.column_config.NumberColumn(format='%.0f', help='Empty if no free throws attempted')
+                    st.dataframe(player_stats[team].sort_index(), use_container_width=True,
+                                 column_config={'FT%': ft_col})
 
     with tab2:  # print game rundown
         with st.container():
             st.markdown(rundown)
 
 
-def check_team_performance(game_data: list) -> list:
+def check_team_performance(game_files: list) -> list:
     """
     For homepage check current team performance in comparison to last game.
 
     ```
-    :param game_data:         list of all game data
+    :param game_files:        list of paths to all game files
     :return :
     ```
     """
     stats = ['PTS', 'FGM', '3PM', 'FT%', 'PF']
     team_data = []  # create team stats dataframe for each match
-    for game in game_data:
-        _, player_stats = build_rundown(game)
-        team_stats = pd.DataFrame(0, columns=stats, index=player_stats.keys())
-        for team in team_stats.index:
-            team_stats.loc[team] = player_stats[team].agg({'FGM': sum, '3PM': sum, 'FT%': 'mean', 'PF': sum})
-        team_stats['Team'] = team_stats.index
-        for team, pts in zip(game['Basics']['Name'].values, game['Basics']['Final'].values):
-            team_stats.loc[team, 'PTS'] = pts
+    for game_file in game_files:
+        file_mtime = game_file.stat().st_mtime
+        _, player_stats = load_rundown(game_file, file_mtime)
+        game = load_game(game_file, file_mtime)  # already cached by building the rundown
+        # aggregate both teams at once
+        team_stats = pd.concat(player_stats, names=['Team']).groupby(level='Team', sort=False).agg(
+            {'FGM': 'sum', '3PM': 'sum', 'FT%': 'mean', 'PF': 'sum'}).rename_axis(None)
+        final_score = dict(zip(game['Basics']['Name'].values, game['Basics']['Final'].values))
+        team_stats['PTS'] = team_stats.index.map(final_score)
+        team_stats = team_stats[stats].assign(Team=team_stats.index)
         team_data.append(team_stats)
 
     return team_data
 
 
+# xpath query finding the table position if given row is the one of our team, compiled once
+FLAMINGO_SEAT_XPATH = etree.XPath('self::tr[.//*[@data-label="Team"][contains(text(), "Flamingo")]]'
+                                  '//*[@data-label="Pos."]/text()')
+
+
+@st.cache_resource  # one session per server process, so connections are kept alive across reruns
+def league_session() -> requests.Session:
+    """
+    Create http session used for scraping the FBL webpage.
+
+    ```
+    :return session:        requests session with pooled connections
+    ```
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = 'flamingo-stats'
+
+    return session
+
+
+@st.cache_data(ttl=3600, show_spinner=False)  # table changes at most once per game day, scrape at most hourly
 def scrape_league_seat(webpage: str = 'https://fbl.berlin/tabellen') -> int:
     """
     Scrape our current table placement from the FBL webpage.
@@ -294,14 +422,15 @@ def scrape_league_seat(webpage: str = 'https://fbl.berlin/tabellen') -> int:
     :return league_seat:    current ranking in table
     ```
     """
-    page = requests.get(webpage)  # parse website
-    page_tree = html.fromstring(page.content)  # get page as xml
-    # use xpath query to find flamingos team
-    teams = page_tree.body.xpath('//*[@data-label="Team"]')  # gather all teams
-    flamingos = [team for team in teams if team.text and 'Flamingo' in team.text]  # look for our team
-    league_seat = int(flamingos[0].getparent().xpath('.//*[@data-label="Pos."]')[0].text)  # extract league seat info
+    page = league_session().get(webpage, timeout=(3, 5))  # parse website, don't block page if it doesn't respond
+    # parse table row by row and stop as soon as our team shows up
+    for _, row in etree.iterparse(io.BytesIO(page.content), events=('end',), tag='tr', html=True):
+        league_seat = FLAMINGO_SEAT_XPATH(row)
+        if league_seat:
+            return int(league_seat[0])  # extract league seat info
+        row.clear()  # free rows of other teams
 
-    return league_seat
+    raise ValueError('Error: Flamingos not found in league table!')
 
 
 def build_sidebar(dates: list) -> tuple:
@@ -333,10 +462,10 @@ def build_sidebar(dates: list) -> tuple:
 # MAIN #
 ############################################################################################################################
 def main():
-    dates, game_data, roster = load_data()  # load data
     # build streamlit page
     st.set_page_config(page_title="Flamingo Fadaways", page_icon="🦩", layout="wide", initial_sidebar_state="expanded",
                        menu_items={'About': "### Source Code on [Github](https://github.com/woldeaman/flamingo_stats)"})
+    dates, game_files = load_dates()  # load game files, data itself is only loaded when needed
     # build sidebar
     show_match, game_idx = build_sidebar(dates)
 
@@ -353,11 +482,11 @@ def main():
                     league_seat = scrape_league_seat()
                 except Exception:  # if it couldn't be scraped, set to zero
                     league_seat = 0
+                team_stats = check_team_performance(game_files[-2:])  # only compare with last game
 
             col1.metric("League Seat", league_seat)
             col1.markdown('')  # space since no diff is shown
             # fill in team performance and trends
-            team_stats = check_team_performance(game_data)
             latest = team_stats[-1][team_stats[-1]['Team'] == 'Flamingo Fadaways']
             previous = team_stats[-2][team_stats[-2]['Team'] == 'Flamingo Fadaways']
             for stat, txt, col in zip(['PTS', 'FT%', 'FGM', '3PM', 'PF'],
@@ -369,9 +498,10 @@ def main():
 
     # print game rundown depending on selection
     if show_match:
-        game_details_page(game_data[game_idx])
+        game_details_page(game_files[game_idx])
 
     # TODO: add this for player stats at a later stage
+    # roster = load_roster()
     # player_selector = st.sidebar.selectbox('Player Stats', options=roster['Name'].values)
     # show_player = st.sidebar.button('Show', key='show_player')
     # if show_player: